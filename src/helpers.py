@@ -2,11 +2,24 @@ import json
 import logging
 import re
 import textwrap
-from functools import reduce
-from typing import Any, Dict, Optional
+from typing import Any, Collection, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+EMAIL_WIDTH = 70
+EMAIL_BODY_TEMPLATE = '\n'.join([
+    '=' * EMAIL_WIDTH,
+    'Amazon Inspector Finding',
+    '-' * EMAIL_WIDTH,
+    'Normalized Inspector Finding',
+    '{finding}',
+    '',
+    '-' * EMAIL_WIDTH,
+    'AI/LLM Recommendation',
+    '{response}'
+])
+
+
 def handle_failure(
     stage: str,
     finding_arn: str,
@@ -41,6 +54,67 @@ def handle_failure(
     }
     
 
+def validate_event(
+    event: Dict[str, Any],
+    supported_types: Collection[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Check that event is an ACTIVE Inspector2 finding of a 
+    supported type.
+
+    Parameters
+    ----------
+    event : Dict[str, Any]
+        EventBridge event
+    supported_types : Collection[str]
+        Finding types to process
+
+    Returns
+    -------
+    Optional[Dict[str, Any]]
+        None if event should be processed, otherwise dictionary 
+        containing:
+        - 'statusCode': 200 if event is skipped, 400 if invalid
+        - 'body': Message indicating why event was not processed
+    """
+    if (event.get('source'), event.get('detail-type')) != \
+            ('aws.inspector2', 'Inspector2 Finding'):
+        logger.info('Skipping event: not an Inspector2 finding', extra={
+            'source': event.get('source'),
+            'detail-type': event.get('detail-type')
+        })
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'message': 'Ignored non-Inspector2 finding'})
+        }
+
+    finding = event.get('detail')
+    if not finding:
+        logger.error('Finding is missing detail field.')
+        return {
+            'statusCode': 400,
+            'body': json.dumps({'error': 'Event did not contain finding.'})
+        }
+
+    status = (finding.get('status') or '').upper()
+    if status != 'ACTIVE':
+        logger.info('Skipping non-ACTIVE finding', extra={'status': status})
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'message': f'Skipping {status} finding'})
+        }
+
+    finding_type = (finding.get('type') or '').upper()
+    if finding_type not in supported_types:
+        logger.info('Skipping non-supported type', extra={'type': finding_type})
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'message': f'Skipping {finding_type} finding'})
+        }
+
+    return None
+
+
 def get_nested(d: Dict, path: list) -> Any:
     """
     Traverse nested dictionary using a tuple of keys to
@@ -59,11 +133,35 @@ def get_nested(d: Dict, path: list) -> Any:
         Desired value or None
     """
     try:
-        return reduce(lambda obj, key: obj[key], path, d)
+        for key in path:
+            d = d[key]
+        return d
     except (KeyError, IndexError, TypeError):
         return None
     
 
+def compile_schema(schema: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Precompile regex patterns in finding schema.
+
+    Parameters
+    ----------
+    schema : Dict[str, Dict]
+        Schema mapping normalized finding names to path and 
+        regex pattern
+
+    Returns
+    -------
+    Dict[str, Dict]
+        Copy of schema with compiled pattern added to each field 
+        under 'regex'
+    """
+    return {
+        field: {**spec, 'regex': re.compile(spec['pattern'])}
+        for field, spec in schema.items()
+    }
+
+
 def normalize_finding(
     finding: Dict[str, Any], 
     schema: Dict[str, Dict]
@@ -77,7 +175,7 @@ def normalize_finding(
         Inspector2 finding
     schema : Dict[str, Dict]
         Schema mapping normalized finding names to path and 
-        regex pattern
+        regex pattern, optionally precompiled by compile_schema()
 
     Returns
     -------
@@ -100,7 +198,8 @@ def normalize_finding(
                 extra={'field': field, 'type': type(value).__name__}
             )
             return None
-        if not re.fullmatch(spec['pattern'], value):
+        regex = spec.get('regex') or re.compile(spec['pattern'])
+        if not regex.fullmatch(value):
             logger.warning(
                 'Field failed regex validation',
                 # Note: 'value' is untrusted input, which is safe for 
@@ -183,15 +282,7 @@ def make_email_body(
     str
         Email body
     """
-    lines = [
-        '='*70,
-        'Amazon Inspector Finding',
-        '-'*70,
-        'Normalized Inspector Finding',
-        json.dumps(normalized, indent=2),
-        '',
-        '-'*70,
-        'AI/LLM Recommendation',
-        textwrap.fill(response, width=70)
-    ]
-    return '\n'.join(lines)
\ No newline at end of file
+    return EMAIL_BODY_TEMPLATE.format(
+        finding=make_user_prompt(normalized),
+        response=textwrap.fill(response, width=EMAIL_WIDTH)
+    )
\ No newline at end of file
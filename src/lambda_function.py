@@ -2,21 +2,29 @@ import boto3
 import json
 import logging
 import os
+import re
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from botocore.exceptions import ClientError
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from helpers import (
+    compile_schema,
     handle_failure,
     normalize_finding,
     make_user_prompt,
     make_email_subj,
-    make_email_body
+    make_email_body,
+    validate_event
 )
 
 # --- Initialize Environment and Global Variables -----------------------------
 # Set Logging
+# With JSON log format, Lambda sets the level from AWS_LAMBDA_LOG_LEVEL
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+if 'AWS_LAMBDA_LOG_LEVEL' not in os.environ:
+    logger.setLevel(logging.INFO)
 
 # Get Environment Variables
 AWS_REGION = os.environ.get('AWS_REGION')
@@ -27,11 +35,17 @@ SNS_TOPIC_ARN = os.environ.get('SNS_TOPIC_ARN')
 if SNS_TOPIC_ARN is None:
     raise RuntimeError('SNS_TOPIC_ARN environment variable is not set')
 
+BEDROCK_LATENCY_MODE = os.environ.get('BEDROCK_LATENCY_MODE', 'standard')
+if BEDROCK_LATENCY_MODE not in ('standard', 'optimized'):
+    raise RuntimeError(
+        f'BEDROCK_LATENCY_MODE must be standard or optimized: {BEDROCK_LATENCY_MODE}'
+    )
+
 # Load Configuration Files
 try:
     with open('field_schema.json', 'r') as file:
-        FINDING_SCHEMA = json.load(file)
-except (FileNotFoundError, json.JSONDecodeError) as e:
+        FINDING_SCHEMA = compile_schema(json.load(file))
+except (FileNotFoundError, json.JSONDecodeError, re.error) as e:
     raise RuntimeError(f'Failed to load field_schema.json: {e}')
 
 try:
@@ -41,27 +55,100 @@ except FileNotFoundError as e:
     raise RuntimeError(f'Failed to load system_prompt.txt: {e}')
 
 # Lambda
-SUPPORTED_FINDING_TYPES = ['PACKAGE_VULNERABILITY']
+SUPPORTED_FINDING_TYPES = frozenset({'PACKAGE_VULNERABILITY'})
+# Findings in a batch are processed concurrently; work is network-bound
+BATCH_MAX_WORKERS = 8
+
+# AWS Clients
+# Created once per container and reused across warm invocations. Two 
+# attempts at the timeouts below fit within the 60-second Lambda timeout, 
+# and the pool holds one connection per batch worker.
+BOTO_CONFIG = Config(
+    connect_timeout=2,
+    read_timeout=25,
+    tcp_keepalive=True,
+    max_pool_connections=BATCH_MAX_WORKERS,
+    retries={'max_attempts': 2, 'mode': 'adaptive'}
+)
 
 # Bedrock
-BEDROCK_MODEL_ID = 'anthropic.claude-3-haiku-20240307-v1:0'
+BEDROCK_MODEL_ID = os.environ.get(
+    'BEDROCK_MODEL_ID', 'anthropic.claude-3-haiku-20240307-v1:0'
+)
 BEDROCK_MAX_TOKENS = 512
-bedrock = boto3.client('bedrock-runtime', region_name=AWS_REGION)
+BEDROCK_CACHE_SIZE = 128
+bedrock = boto3.client(
+    'bedrock-runtime', region_name=AWS_REGION, config=BOTO_CONFIG
+)
 
 # SNS
 SNS_SUBJECT_MAX_LENGTH = 100
-sns = boto3.client('sns', region_name=AWS_REGION)
+sns = boto3.client('sns', region_name=AWS_REGION, config=BOTO_CONFIG)
 
 
 # --- Define Helper Functions -------------------------------------------------
+@lru_cache(maxsize=BEDROCK_CACHE_SIZE)
+def converse_text(
+    system_prompt: str,
+    user_prompt: str,
+    model_id: str,
+    max_tokens: int,
+    latency: str
+) -> str:
+    """
+    Get model response text via AWS Bedrock Converse API.
+
+    Responses are cached per container, so a redelivered or 
+    re-published finding with the same normalized fields does not 
+    call Bedrock again. Failed calls raise and are not cached.
+
+    Parameters
+    ----------
+    See call_bedrock().
+
+    Returns
+    -------
+    str
+        Model response text
+
+    Raises
+    ------
+    ClientError
+        If Bedrock API call fails
+    """
+    response = bedrock.converse(
+        modelId=model_id,
+        system=[{"text": system_prompt}],
+        messages=[
+            {
+                "role": "user",
+                "content": [{"text": user_prompt}]
+            }
+        ],
+        inferenceConfig={
+            "maxTokens": max_tokens,
+            "temperature": 0.0
+        },
+        performanceConfig={"latency": latency}
+    )
+    stop_reason = response.get('stopReason')
+    if stop_reason == 'max_tokens':
+        logger.warning(
+            'Bedrock response was truncated at max_tokens limit',
+            extra={'max_tokens': max_tokens}
+        )
+    return response["output"]["message"]["content"][0]["text"]
+
+
 def call_bedrock(
     system_prompt: str,
     user_prompt: str,
     model_id: str,
-    max_tokens: int = 512
+    max_tokens: int = 512,
+    latency: str = 'standard'
 ) -> Optional[str]:
     """
-    Call LLM via AWS Bedrock Converse API.
+    Call LLM via AWS Bedrock Converse API, reusing cached responses.
 
     Parameters
     ----------
@@ -75,6 +162,10 @@ def call_bedrock(
         Bedrock model identifier
     max_tokens : int
         Maximum number of tokens in response
+    latency : str, default 'standard'
+        Bedrock latency tier ('standard' or 'optimized'). The 
+        optimized tier is only available for some models and 
+        regions.
 
     Returns
     -------
@@ -82,27 +173,9 @@ def call_bedrock(
         Model response text, or None if call fails
     """
     try:
-        response = bedrock.converse(
-            modelId=model_id,
-            system=[{"text": system_prompt}],
-            messages=[
-                {
-                    "role": "user",
-                    "content": [{"text": user_prompt}]
-                }
-            ],
-            inferenceConfig={
-                "maxTokens": max_tokens,
-                "temperature": 0.0
-            }
+        return converse_text(
+            system_prompt, user_prompt, model_id, max_tokens, latency
         )
-        stop_reason = response.get('stopReason')
-        if stop_reason == 'max_tokens':
-            logger.warning(
-                'Bedrock response was truncated at max_tokens limit',
-                extra={'max_tokens': max_tokens}
-            )
-        return response["output"]["message"]["content"][0]["text"]
     except ClientError as e:
         logger.error(
             "Bedrock API call failed",
@@ -148,10 +221,23 @@ def send_email_alert(
         return False
 
 
-# --- Lambda Handler ----------------------------------------------------------
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+# --- Process Events ----------------------------------------------------------
+def process_event(event: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Lambda handler to get AI/LLM recommendations for Amazon Inspector findings.
+    Get AI/LLM recommendation for a single Inspector2 finding event
+    and send it via SNS.
+
+    Parameters
+    ----------
+    event : Dict[str, Any]
+        EventBridge event
+
+    Returns
+    -------
+    Dict[str, Any]
+        Dictionary containing:
+        - 'statusCode': HTTP status code
+        - 'body': Message describing outcome
     """
     try:
         # Log Event Received
@@ -163,56 +249,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'resources': event.get('resources')
         })
     
-        # Validate Event
-        if event.get('source') != 'aws.inspector2':
-            logger.info('Skipping event: source is not aws.inspector2')
-            return {
-                'statusCode': 200,
-                'body': json.dumps({
-                    'message': 'Ignored non-Inspector2 finding'
-                })
-            }
-    
-        if event.get('detail-type') != 'Inspector2 Finding':
-            logger.info('Skipping event: detail-type is not Inspector2 Finding')
-            return {
-                'statusCode': 200,
-                'body': json.dumps({
-                    'message': 'Ignored non-Inspector2 finding'
-                })
-            }
-    
-        # Validate Finding
-        finding = event.get('detail')
-        if not finding:
-            logger.error('Finding is missing detail field.')
-            return {
-                'statusCode': 400,
-                'body': json.dumps({
-                    'error': 'Event did not contain finding.'
-                })
-            }
-    
-        status = finding.get('status', '').upper()
-        if status != 'ACTIVE':
-            logger.info('Skipping non-ACTIVE finding', extra={'status': status})
-            return {
-                'statusCode': 200,
-                'body': json.dumps({
-                    'message': f'Skipping {status} finding'
-                })
-            }
-        
-        finding_type = finding.get('type', '').upper()
-        if finding_type not in SUPPORTED_FINDING_TYPES:
-            logger.info('Skipping non-supported type', extra={'type': finding_type})
-            return {
-                'statusCode': 200,
-                'body': json.dumps({
-                    'message': f'Skipping {finding_type} finding'
-                })
-            }
-        
+        # Validate Event and Finding
+        skipped = validate_event(event, SUPPORTED_FINDING_TYPES)
+        if skipped is not None:
+            return skipped
+        finding = event['detail']
+
         # Extract Finding ARN for Error Tracking
         finding_arn = finding.get('findingArn', 'unknown')
         
@@ -229,7 +271,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             system_prompt=SYSTEM_PROMPT, 
             user_prompt=user_prompt, 
             model_id=BEDROCK_MODEL_ID, 
-            max_tokens=BEDROCK_MAX_TOKENS
+            max_tokens=BEDROCK_MAX_TOKENS,
+            latency=BEDROCK_LATENCY_MODE
         )
         if response is None:
             return handle_failure('Calling Bedrock', finding_arn, error_code=500)
@@ -249,10 +292,74 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
 
     except Exception:
-        logger.exception('Unexpected error in lambda_handler')
+        logger.exception('Unexpected error processing event')
         return {
             'statusCode': 500,
             'body': json.dumps({
                 'error': 'Internal server error'
             })
-        }
\ No newline at end of file
+        }
+
+
+def process_batch(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Process batch of SQS records, each containing an EventBridge 
+    event in the message body.
+
+    Each finding gets its own prompt and email, so untrusted content 
+    from one finding never shares a prompt with another. Findings are 
+    processed concurrently.
+
+    Parameters
+    ----------
+    records : List[Dict[str, Any]]
+        SQS records
+
+    Returns
+    -------
+    Dict[str, Any]
+        Dictionary containing:
+        - 'batchItemFailures': Message IDs of records to retry
+    """
+    parsed = []
+    failures = []
+    for record in records:
+        message_id = record.get('messageId')
+        try:
+            parsed.append((message_id, json.loads(record['body'])))
+        except (KeyError, TypeError, json.JSONDecodeError):
+            # Report as failed so the record ends up in the DLQ for review
+            logger.error(
+                'Record body is not a valid event',
+                extra={'message_id': message_id}
+            )
+            failures.append({'itemIdentifier': message_id})
+
+    if not parsed:
+        return {'batchItemFailures': failures}
+
+    # boto3 clients are thread-safe, so findings share module clients
+    max_workers = min(BATCH_MAX_WORKERS, len(parsed))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(process_event, [e for _, e in parsed]))
+
+    failures.extend(
+        {'itemIdentifier': message_id}
+        for (message_id, _), result in zip(parsed, results)
+        if result['statusCode'] >= 500
+    )
+    return {'batchItemFailures': failures}
+
+
+# --- Lambda Handler ----------------------------------------------------------
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler to get AI/LLM recommendations for Amazon Inspector findings.
+
+    Accepts either a single EventBridge event or a batch of SQS 
+    records. Batches report partial failures so only failed findings 
+    are retried.
+    """
+    if 'Records' in event:
+        return process_batch(event['Records'])
+    return process_event(event)
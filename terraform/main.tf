@@ -10,6 +10,42 @@ resource "aws_sns_topic_subscription" "email" {
 }
 
 
+# --- SQS Queue ---------------------------------------------------------------
+resource "aws_sqs_queue" "findings_dlq" {
+  name                      = "${var.project_name}-findings-dlq"
+  message_retention_seconds = 1209600
+}
+
+resource "aws_sqs_queue" "findings" {
+  name                       = "${var.project_name}-findings"
+  visibility_timeout_seconds = var.lambda_timeout * 6
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.findings_dlq.arn
+    maxReceiveCount     = 3
+  })
+}
+
+resource "aws_sqs_queue_policy" "findings" {
+  queue_url = aws_sqs_queue.findings.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect    = "Allow"
+        Principal = { Service = "events.amazonaws.com" }
+        Action    = "sqs:SendMessage"
+        Resource  = aws_sqs_queue.findings.arn
+        Condition = {
+          ArnEquals = { "aws:SourceArn" = aws_cloudwatch_event_rule.inspector2_findings.arn }
+        }
+      }
+    ]
+  })
+}
+
+
 # --- IAM Role ----------------------------------------------------------------
 resource "aws_iam_role" "lambda" {
   name = "${var.project_name}-lambda-role"
@@ -33,6 +69,23 @@ resource "aws_iam_role_policy_attachment" "lambda_basic" {
 }
 
 # Bedrock
+# Cross-region inference profile IDs (e.g. us.anthropic...) route to the
+# backing foundation model in any region of the profile, so both the
+# profile and the model in every region must be allowed.
+data "aws_caller_identity" "current" {}
+
+locals {
+  bedrock_inference_profile = can(regex("^(us|eu|apac|us-gov|global)\\.", var.bedrock_model_id))
+  bedrock_foundation_model  = local.bedrock_inference_profile ? regex("^[a-z-]+\\.(.+)$", var.bedrock_model_id)[0] : var.bedrock_model_id
+
+  bedrock_model_arns = local.bedrock_inference_profile ? [
+    "arn:aws:bedrock:${var.aws_region}:${data.aws_caller_identity.current.account_id}:inference-profile/${var.bedrock_model_id}",
+    "arn:aws:bedrock:*::foundation-model/${local.bedrock_foundation_model}"
+  ] : [
+    "arn:aws:bedrock:${var.aws_region}::foundation-model/${var.bedrock_model_id}"
+  ]
+}
+
 resource "aws_iam_role_policy" "bedrock" {
   name = "${var.project_name}-bedrock-policy"
   role = aws_iam_role.lambda.id
@@ -43,7 +96,7 @@ resource "aws_iam_role_policy" "bedrock" {
       {
         Effect   = "Allow"
         Action   = "bedrock:InvokeModel"
-        Resource = "arn:aws:bedrock:${var.aws_region}::foundation-model/${var.bedrock_model_id}"
+        Resource = local.bedrock_model_arns
       }
     ]
   })
@@ -66,6 +119,27 @@ resource "aws_iam_role_policy" "sns" {
   })
 }
 
+# SQS Consume
+resource "aws_iam_role_policy" "sqs" {
+  name = "${var.project_name}-sqs-policy"
+  role = aws_iam_role.lambda.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = aws_sqs_queue.findings.arn
+      }
+    ]
+  })
+}
+
 
 # --- CloudWatch Log Group ----------------------------------------------------
 resource "aws_cloudwatch_log_group" "lambda" {
@@ -86,9 +160,18 @@ resource "aws_lambda_function" "findings" {
   # Placeholder — code deployed separately
   filename      = "../config/placeholder.zip"
 
+  # JSON format keeps the structured 'extra' fields in CloudWatch
+  logging_config {
+    log_format            = "JSON"
+    log_group             = aws_cloudwatch_log_group.lambda.name
+    application_log_level = var.lambda_log_level
+  }
+
   environment {
     variables = {
-      SNS_TOPIC_ARN = aws_sns_topic.findings.arn
+      SNS_TOPIC_ARN        = aws_sns_topic.findings.arn
+      BEDROCK_MODEL_ID     = var.bedrock_model_id
+      BEDROCK_LATENCY_MODE = var.bedrock_latency_mode
     }
   }
 
@@ -115,16 +198,18 @@ resource "aws_cloudwatch_event_rule" "inspector2_findings" {
   })
 }
 
-resource "aws_cloudwatch_event_target" "lambda" {
+resource "aws_cloudwatch_event_target" "sqs" {
   rule      = aws_cloudwatch_event_rule.inspector2_findings.name
   target_id = "${var.project_name}-target"
-  arn       = aws_lambda_function.findings.arn
+  arn       = aws_sqs_queue.findings.arn
 }
 
-resource "aws_lambda_permission" "eventbridge" {
-  statement_id  = "AllowEventBridgeInvoke"
-  action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.findings.function_name
-  principal     = "events.amazonaws.com"
-  source_arn    = aws_cloudwatch_event_rule.inspector2_findings.arn
+resource "aws_lambda_event_source_mapping" "sqs" {
+  event_source_arn                   = aws_sqs_queue.findings.arn
+  function_name                      = aws_lambda_function.findings.arn
+  batch_size                         = var.lambda_batch_size
+  maximum_batching_window_in_seconds = var.lambda_batching_window
+  function_response_types            = ["ReportBatchItemFailures"]
+
+  depends_on = [aws_iam_role_policy.sqs]
 }
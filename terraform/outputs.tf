@@ -13,6 +13,16 @@ output "sns_topic_arn" {
   value       = aws_sns_topic.findings.arn
 }
 
+output "sqs_queue_url" {
+  description = "SQS findings queue URL"
+  value       = aws_sqs_queue.findings.url
+}
+
+output "sqs_dlq_url" {
+  description = "SQS dead-letter queue URL"
+  value       = aws_sqs_queue.findings_dlq.url
+}
+
 output "eventbridge_rule_name" {
   description = "EventBridge rule name"
   value       = aws_cloudwatch_event_rule.inspector2_findings.name
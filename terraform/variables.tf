@@ -16,11 +16,22 @@ variable "email_address" {
 }
 
 variable "bedrock_model_id" {
-  description = "Bedrock model ID for LLM recommendations"
+  description = "Bedrock model ID or cross-region inference profile ID (e.g. us.anthropic.claude-3-5-haiku-20241022-v1:0) for LLM recommendations"
   type        = string
   default     = "anthropic.claude-3-haiku-20240307-v1:0"
 }
 
+variable "bedrock_latency_mode" {
+  description = "Bedrock latency tier (standard or optimized); optimized requires an inference profile ID for a supported model and region"
+  type        = string
+  default     = "standard"
+
+  validation {
+    condition     = contains(["standard", "optimized"], var.bedrock_latency_mode)
+    error_message = "bedrock_latency_mode must be standard or optimized."
+  }
+}
+
 variable "lambda_timeout" {
   description = "Lambda function timeout in seconds"
   type        = number
@@ -33,6 +44,29 @@ variable "lambda_memory_size" {
   default     = 128
 }
 
+variable "lambda_log_level" {
+  description = "Lambda application log level"
+  type        = string
+  default     = "INFO"
+
+  validation {
+    condition     = contains(["TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FATAL"], var.lambda_log_level)
+    error_message = "lambda_log_level must be a Lambda application log level."
+  }
+}
+
+variable "lambda_batch_size" {
+  description = "Maximum number of findings per Lambda invocation"
+  type        = number
+  default     = 5
+}
+
+variable "lambda_batching_window" {
+  description = "Maximum seconds to wait while gathering a batch of findings"
+  type        = number
+  default     = 5
+}
+
 variable "lambda_runtime" {
   description = "Lambda function runtime"
   type        = string
@@ -40,6 +40,12 @@ with patch('builtins.open', side_effect=_patched_open), \
 
 
 # --- Fixtures ----------------------------------------------------------------
+# Autouse
+@pytest.fixture(autouse=True)
+def clear_bedrock_cache():
+    lambda_function.converse_text.cache_clear()
+
+
 # Saved
 @pytest.fixture
 def valid_event():
@@ -85,6 +91,17 @@ def bedrock_response():
         }
     return _make
 
+@pytest.fixture
+def sqs_event():
+    def _make(*events) -> dict:
+        return {
+            'Records': [
+                {'messageId': str(i), 'body': json.dumps(event)}
+                for i, event in enumerate(events)
+            ]
+        }
+    return _make
+
 @pytest.fixture
 def client_error():
     return ClientError(
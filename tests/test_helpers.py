@@ -1,12 +1,14 @@
 import json
 
 from helpers import (
+    compile_schema,
     handle_failure,
     get_nested,
     normalize_finding,
     make_user_prompt,
     make_email_subj,
-    make_email_body
+    make_email_body,
+    validate_event
 )
 
 
@@ -26,6 +28,35 @@ def test_handle_failure_error_code(valid_finding):
     assert error['statusCode'] == 400
 
 
+# --- validate_event() --------------------------------------------------------
+def test_validate_event(active_event):
+    assert validate_event(active_event, {'PACKAGE_VULNERABILITY'}) is None
+
+
+def test_validate_event_non_inspector_source(active_event):
+    active_event['source'] = 'aws.ec2'
+    result = validate_event(active_event, {'PACKAGE_VULNERABILITY'})
+    assert result['statusCode'] == 200
+
+
+def test_validate_event_missing_detail(active_event):
+    del active_event['detail']
+    result = validate_event(active_event, {'PACKAGE_VULNERABILITY'})
+    assert result['statusCode'] == 400
+
+
+def test_validate_event_non_active_status(valid_event):
+    result = validate_event(valid_event, {'PACKAGE_VULNERABILITY'})
+    assert result['statusCode'] == 200
+    assert 'CLOSED' in json.loads(result['body'])['message']
+
+
+def test_validate_event_unsupported_type(active_event):
+    result = validate_event(active_event, {'NETWORK_REACHABILITY'})
+    assert result['statusCode'] == 200
+    assert 'PACKAGE_VULNERABILITY' in json.loads(result['body'])['message']
+
+
 # --- get_nested() ------------------------------------------------------------
 def test_get_nested(valid_finding, field_schema):
     spec = field_schema['cvss']
@@ -44,6 +75,16 @@ def test_get_nested_non_subscriptable(valid_finding):
     assert value is None
 
 
+# --- compile_schema() --------------------------------------------------------
+def test_compile_schema(field_schema):
+    compiled = compile_schema(field_schema)
+    assert compiled.keys() == field_schema.keys()
+    for field, spec in compiled.items():
+        assert spec['path'] == field_schema[field]['path']
+        assert spec['regex'].pattern == field_schema[field]['pattern']
+    assert 'regex' not in field_schema['severity']
+
+
 # --- normalize_finding() -----------------------------------------------------
 def test_normalize_finding(valid_finding, field_schema):
     finding = normalize_finding(valid_finding, field_schema)
@@ -53,6 +94,18 @@ def test_normalize_finding(valid_finding, field_schema):
         assert isinstance(finding[key], str)
 
 
+def test_normalize_finding_compiled_schema(valid_finding, field_schema):
+    compiled = compile_schema(field_schema)
+    assert normalize_finding(valid_finding, compiled) == \
+        normalize_finding(valid_finding, field_schema)
+
+
+def test_normalize_finding_compiled_schema_invalid(valid_finding, field_schema):
+    valid_finding['severity'] = 'INVALID'
+    finding = normalize_finding(valid_finding, compile_schema(field_schema))
+    assert finding is None
+
+
 def test_normalize_finding_field_missing(valid_finding, field_schema):
     del valid_finding['severity']
     finding = normalize_finding(valid_finding, field_schema)
@@ -110,6 +163,13 @@ def test_make_email_body(normalized_finding):
     assert response in email_body
 
 
+def test_make_email_body_finding_lines(normalized_finding):
+    email_body = make_email_body(normalized_finding, 'Update packages.')
+    assert '{' not in email_body
+    for key, value in normalized_finding.items():
+        assert f'{key}: {value}' in email_body
+
+
 # --- system_prompt -----------------------------------------------------------
 def test_system_prompt_untrusted_input_instruction(system_prompt):
     assert 'untrusted' in system_prompt.lower()
\ No newline at end of file
@@ -1,3 +1,4 @@
+import copy
 import json
 from unittest.mock import patch
 
@@ -40,6 +41,45 @@ def test_call_bedrock_max_tokens(bedrock_response):
     assert result == expected
 
 
+def test_call_bedrock_latency(bedrock_response):
+    with patch.object(lambda_function.bedrock, 'converse',
+                      return_value=bedrock_response('text')) as converse:
+        lambda_function.call_bedrock(
+            system_prompt='system',
+            user_prompt='user',
+            model_id=lambda_function.BEDROCK_MODEL_ID,
+            latency='optimized'
+        )
+    assert converse.call_args.kwargs['performanceConfig'] == {'latency': 'optimized'}
+
+
+def test_call_bedrock_cached(bedrock_response):
+    with patch.object(lambda_function.bedrock, 'converse',
+                      return_value=bedrock_response('text')) as converse:
+        for _ in range(2):
+            result = lambda_function.call_bedrock(
+                system_prompt='system',
+                user_prompt='user',
+                model_id=lambda_function.BEDROCK_MODEL_ID
+            )
+    assert result == 'text'
+    assert converse.call_count == 1
+
+
+def test_call_bedrock_client_error_not_cached(client_error, bedrock_response):
+    with patch.object(lambda_function.bedrock, 'converse',
+                      side_effect=[client_error, bedrock_response('text')]):
+        results = [
+            lambda_function.call_bedrock(
+                system_prompt='system',
+                user_prompt='user',
+                model_id=lambda_function.BEDROCK_MODEL_ID
+            )
+            for _ in range(2)
+        ]
+    assert results == [None, 'text']
+
+
 # --- send_email_alert() ------------------------------------------------------
 def test_send_email_alert_success():
     with patch.object(lambda_function.sns, 'publish'):
@@ -95,3 +135,58 @@ def test_lambda_handler_non_inspector_source(active_event):
     active_event['source'] = 'aws.ec2'
     result = lambda_function.lambda_handler(active_event, None)
     assert result['statusCode'] == 200
+
+
+def test_lambda_handler_skipped_event_no_aws_calls(valid_event):
+    with patch.object(lambda_function.bedrock, 'converse') as converse, \
+         patch.object(lambda_function.sns, 'publish') as publish:
+        result = lambda_function.lambda_handler(valid_event, None)
+    assert result['statusCode'] == 200
+    converse.assert_not_called()
+    publish.assert_not_called()
+
+
+def test_lambda_handler_batch(active_event, sqs_event, bedrock_response):
+    event = sqs_event(active_event, active_event)
+    with patch.object(lambda_function.bedrock, 'converse',
+                      return_value=bedrock_response('Update the snapd package.')), \
+         patch.object(lambda_function.sns, 'publish') as publish:
+        result = lambda_function.lambda_handler(event, None)
+    assert result == {'batchItemFailures': []}
+    assert publish.call_count == 2
+
+
+def test_lambda_handler_batch_partial_failure(active_event, sqs_event, bedrock_response):
+    invalid_event = copy.deepcopy(active_event)
+    invalid_event['detail']['severity'] = 'INVALID'
+    event = sqs_event(active_event, invalid_event)
+    with patch.object(lambda_function.bedrock, 'converse',
+                      return_value=bedrock_response('Update the snapd package.')), \
+         patch.object(lambda_function.sns, 'publish'):
+        result = lambda_function.lambda_handler(event, None)
+    assert result == {'batchItemFailures': [{'itemIdentifier': '1'}]}
+
+
+def test_lambda_handler_batch_malformed_body(sqs_event):
+    event = sqs_event()
+    event['Records'].append({'messageId': '0', 'body': 'not json'})
+    result = lambda_function.lambda_handler(event, None)
+    assert result == {'batchItemFailures': [{'itemIdentifier': '0'}]}
+
+
+def test_lambda_handler_batch_malformed_body_with_valid(
+    active_event, sqs_event, bedrock_response
+):
+    event = sqs_event(active_event)
+    event['Records'].append({'messageId': '1', 'body': 'not json'})
+    with patch.object(lambda_function.bedrock, 'converse',
+                      return_value=bedrock_response('Update the snapd package.')), \
+         patch.object(lambda_function.sns, 'publish') as publish:
+        result = lambda_function.lambda_handler(event, None)
+    assert result == {'batchItemFailures': [{'itemIdentifier': '1'}]}
+    assert publish.call_count == 1
+
+
+def test_lambda_handler_batch_empty(sqs_event):
+    result = lambda_function.lambda_handler(sqs_event(), None)
+    assert result == {'batchItemFailures': []}